@@ -1,18 +1,23 @@
 import streamlit as st
-import json
-import random
-import pandas as pd
+import ijson
+import orjson
+import os
+import time
+import uuid
+import zlib
 from datetime import datetime
 
 # --- 앱 설정 및 상수 ---
 APP_TITLE = "대화 데이터 다중 파일 평가 도구"
-EVAL_CRITERIA = [
+EVAL_CRITERIA = (
     "1. User A의 말은 제시된 배경 상황과 하나의 자연스러운 장면으로 잘 어울리나요?",
     "2. 생성된 배경의 내용은 현실적이고 명확하게 이해하기 쉽나요?",
     "3. User B의 대답은 User A의 말과 배경 상황(background)에 논리적으로 일관성 있게 잘 연결되나요?",
     "4. User B의 대답은 문법, 어휘 사용이 적절하고 표현이 실제 대화처럼 자연스럽나요?",
     "5. 이 전체 대화(User A - 배경 - User B)는 의미 있고 자연스러워서 데이터셋에 포함할 가치가 있나요?"
-]
+)
+EVAL_CRITERIA_KEYS = tuple(f"q_{i}" for i in range(len(EVAL_CRITERIA))) # 평가 항목별 위젯 키 접두사 (모듈 로드 시 한 번만 생성)
+SCORE_OPTIONS = (1, 2, 3, 4, 5) # 평가 점수 선택지 (rerun마다 리스트를 새로 만들지 않도록 상수로 정의)
 SAMPLE_FRACTION = 0.1 # 10% 샘플링
 
 # 사용자가 평가할 JSON 파일 목록 (실제 파일 경로로 수정해주세요)
@@ -25,113 +30,154 @@ DATA_FILES = {
     "how2sign_val": "data/filtered_how2sign_val.json", # 실제 파일명 또는 경로로 변경
     "openasl_data": "data/filtered_openasl_data.json"  # 실제 파일명 또는 경로로 변경
 }
+SIDEBAR_FILE_OPTIONS = ("파일을 선택하세요...", *DATA_FILES.keys()) # 사이드바 파일 선택지 (모듈 로드 시 한 번만 생성)
+# 제출된 평가 결과를 한 줄씩 추가 기록하는 JSONL 파일 저장 위치
+# 보존 정책: 세션이 새 평가(파일 변경/초기화/선택 해제)를 시작하면 이전 로그는 삭제되므로,
+# 세션당 마지막 평가 로그 1개만 남습니다. 종료된 세션의 로그는 자동 삭제되지 않으므로 필요시 이 디렉터리를 주기적으로 정리해주세요.
+EVAL_LOG_DIR = "evaluations"
 
 # --- 유틸리티 함수 ---
-@st.cache_data # 데이터 로딩은 캐싱
-def load_json_data(file_path):
-    """지정된 경로의 JSON 파일을 로드합니다."""
+def get_sample_size(total, fraction):
+    """전체 개수에서 지정된 비율만큼의 샘플 수를 계산합니다. 최소 1개는 샘플링합니다."""
+    num_samples = int(total * fraction)
+    if total > 0 and num_samples == 0:
+        num_samples = 1 # 최소 1개 샘플링
+    if num_samples > total:
+        num_samples = total # 샘플 수가 전체 데이터 수보다 클 수 없음
+    return num_samples
+
+def get_sample_seed(file_key, nonce=0):
+    """파일 키와 nonce로부터 고정된 샘플링 시드를 만듭니다 (rerun 간 동일한 샘플 → 캐시 적중).
+
+    nonce는 "현재 파일 평가 초기화" 시에만 증가하여 새로운 샘플을 뽑도록 합니다.
+    """
+    return zlib.crc32(f"{file_key}:{nonce}".encode('utf-8'))
+
+@st.cache_data(ttl=None, show_spinner=False) # 아이템 수 세기는 파일당 한 번만 수행
+def count_json_items(file_path):
+    """JSON 배열의 아이템 수를 ijson으로 스트리밍하며 셉니다."""
+    with open(file_path, 'rb') as f:
+        return sum(1 for _ in ijson.items(f, 'item', use_float=True))
+
+# 샘플링 결과를 세션 간 복사 없이 공유
+# 초기화할 때마다 nonce로 새 샘플이 생기므로, 캐시가 계속 늘어나지 않도록 항목 수를 제한
+@st.cache_resource(ttl=None, show_spinner=False, max_entries=len(DATA_FILES) * 2)
+def stream_and_sample(file_path, fraction, seed):
+    """JSON 배열을 ijson으로 스트리밍하며 seed로 고정된 샘플만 반환합니다. 로드 실패 시 None.
+
+    전체 리스트를 메모리에 올리지 않도록, 캐싱된 아이템 수로 인덱스를 미리 뽑아두고
+    스트리밍하며 해당 인덱스의 아이템만 보관합니다.
+    반환된 리스트는 모든 세션이 같은 객체를 공유하므로 호출 측에서 수정하면 안 됩니다 (읽기 전용).
+    """
+    import numpy as np # 파일 선택 시에만 필요하므로 지연 import (앱 시작 시간 단축)
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data
+        total = count_json_items(file_path)
+        # 인덱스 샘플링은 numpy에서 수행 (비복원 추출)
+        picked = np.random.default_rng(seed).choice(total, get_sample_size(total, fraction), replace=False).tolist()
+        wanted = set(picked)
+        found = {}
+        with open(file_path, 'rb') as f:
+            # use_float=True: 소수를 Decimal이 아닌 float로 읽어 json.load와 같은 타입 유지 (orjson 직렬화 가능)
+            for idx, item in enumerate(ijson.items(f, 'item', use_float=True)):
+                if idx in wanted:
+                    found[idx] = item
+                    if len(found) == len(wanted):
+                        break
+        return [found[idx] for idx in picked] # 샘플링된 순서 유지
     except FileNotFoundError:
         st.error(f"오류: '{file_path}' 파일을 찾을 수 없습니다. 파일 경로를 확인하거나, GitHub 저장소에 파일이 올바르게 포함되었는지 확인해주세요.")
         return None
-    except json.JSONDecodeError:
+    except ijson.JSONError:
         st.error(f"오류: '{file_path}' 파일이 올바른 JSON 형식이 아닙니다.")
         return None
     except Exception as e:
         st.error(f"'{file_path}' 파일 로드 중 오류 발생: {e}")
         return None
 
-def get_sampled_data(data, fraction):
-    """데이터에서 지정된 비율만큼 랜덤 샘플링합니다. 최소 1개는 샘플링합니다."""
-    if not data:
-        return []
-    num_samples = int(len(data) * fraction)
-    if len(data) > 0 and num_samples == 0:
-        num_samples = 1 # 최소 1개 샘플링
-    if num_samples > len(data):
-        num_samples = len(data) # 샘플 수가 전체 데이터 수보다 클 수 없음
-    return random.sample(data, num_samples)
+def append_evaluation_log(log_path, evaluation_entry):
+    """평가 결과 하나를 JSONL 파일에 한 줄로 추가합니다 (제출당 O(1)). 기록 실패 시 False."""
+    try:
+        os.makedirs(EVAL_LOG_DIR, exist_ok=True)
+        with open(log_path, 'ab') as f:
+            f.write(orjson.dumps(evaluation_entry) + b"\n")
+        return True
+    except OSError as e:
+        st.error(f"오류: 평가 결과를 '{log_path}'에 저장하지 못했습니다. 다시 제출해주세요. ({e})")
+        return False
+
+def discard_evaluation_log(log_path):
+    """더 이상 사용하지 않는 평가 로그 파일을 삭제합니다 (없거나 삭제 실패 시 무시)."""
+    if not log_path:
+        return
+    try:
+        os.remove(log_path)
+    except OSError:
+        pass
+
+def read_evaluation_log(log_path):
+    """JSONL 파일에 기록된 평가 결과 리스트를 읽어옵니다."""
+    with open(log_path, 'rb') as f:
+        return [orjson.loads(line) for line in f if line.strip()]
+
+# 다운로드 데이터 직렬화는 결과가 바뀔 때(제출 시)만 다시 수행하도록 캐싱
+# 결과 버전은 (로그 파일 경로, 결과 개수)로 식별 (로그 파일은 평가 시작/초기화마다 새로 생성됨)
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_download_payloads(log_path, num_evaluations):
+    """평가 로그를 한 번만 읽어 CSV(utf-8-sig) bytes와 JSON(UTF-8) bytes를 함께 만듭니다."""
+    import pandas as pd # 결과 다운로드 시에만 필요하므로 지연 import (앱 시작 시간 단축)
+    from dateutil.tz import tzlocal # pandas 의존성으로 함께 설치됨
+    records = read_evaluation_log(log_path)
+    df = pd.DataFrame(records)
+    # 제출 시에는 time.time_ns()만 저장하고, 변환은 여기서 컬럼 단위로 한 번에 수행
+    # (고정 오프셋이 아닌 로컬 시간대를 사용해 DST 이전에 기록된 시각도 당시 로컬 시각으로 변환)
+    timestamps = pd.to_datetime(df.pop("evaluation_timestamp_ns"), unit='ns', utc=True)
+    df["evaluation_timestamp"] = timestamps.dt.tz_convert(tzlocal()).dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+    csv_bytes = df.to_csv(index=False).encode('utf-8-sig')
+    # JSON은 DataFrame을 레코드로 되돌리지 않고, 원본 레코드에 변환된 타임스탬프만 채워 넣음
+    for record, timestamp in zip(records, df["evaluation_timestamp"].tolist()):
+        del record["evaluation_timestamp_ns"]
+        record["evaluation_timestamp"] = timestamp
+    json_bytes = orjson.dumps(records, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return csv_bytes, json_bytes
 
 # --- 세션 상태 초기화 함수 ---
 def initialize_session_state():
     """앱의 세션 상태 변수를 초기화합니다."""
-    if "current_eval_file_key" not in st.session_state: # 현재 선택된 파일의 '키' (DATA_FILES의 키)
-        st.session_state.current_eval_file_key = None
-    if "sampled_data" not in st.session_state: # 현재 파일의 샘플링된 데이터
-        st.session_state.sampled_data = []
-    if "current_item_index" not in st.session_state: # 현재 평가 중인 아이템 인덱스
-        st.session_state.current_item_index = 0
-    if "evaluations_for_current_file" not in st.session_state: # 현재 파일에 대한 평가 결과 누적
-        st.session_state.evaluations_for_current_file = []
-    if "evaluation_of_current_file_complete" not in st.session_state:
-        st.session_state.evaluation_of_current_file_complete = False
-    if "all_collected_evaluations" not in st.session_state: # 모든 파일의 평가 결과를 저장 (선택적)
-        st.session_state.all_collected_evaluations = {} # {file_key: [evaluations]}
+    st.session_state.setdefault("current_eval_file_key", None) # 현재 선택된 파일의 '키' (DATA_FILES의 키)
+    st.session_state.setdefault("sampled_data", []) # 현재 파일의 샘플링된 데이터
+    st.session_state.setdefault("current_item_index", 0) # 현재 평가 중인 아이템 인덱스
+    st.session_state.setdefault("eval_log_path", None) # 현재 파일의 평가 결과가 기록되는 JSONL 파일 경로
+    st.session_state.setdefault("num_evaluations_for_current_file", 0) # 현재 파일에 대해 제출된 평가 수
+    st.session_state.setdefault("download_timestamp", None) # 다운로드 파일명에 쓰는 시각 (결과가 바뀔 때만 갱신)
+    st.session_state.setdefault("evaluation_of_current_file_complete", False)
+    st.session_state.setdefault("sample_nonces", {}) # 파일별 샘플링 nonce (초기화 시 증가) {file_key: int}
 
 def reset_evaluation_state_for_new_file(file_key):
     """새로운 파일을 평가하기 위해 관련 세션 상태를 초기화/설정합니다."""
     st.session_state.current_eval_file_key = file_key
     file_path = DATA_FILES[file_key]
-    all_data_for_file = load_json_data(file_path)
-    if all_data_for_file is not None:
-        st.session_state.sampled_data = get_sampled_data(all_data_for_file, SAMPLE_FRACTION)
+    nonce = st.session_state.sample_nonces.get(file_key, 0)
+    sampled_data = stream_and_sample(file_path, SAMPLE_FRACTION, get_sample_seed(file_key, nonce))
+    if sampled_data is not None:
+        st.session_state.sampled_data = sampled_data
         if not st.session_state.sampled_data:
             st.warning(f"'{file_key}' 파일에서 샘플링된 데이터가 없습니다. 파일 내용을 확인해주세요.")
     else:
         st.session_state.sampled_data = [] # 로드 실패 시 빈 리스트
         
     st.session_state.current_item_index = 0
-    st.session_state.evaluations_for_current_file = []
+    # 평가 시작/초기화마다 새로운 로그 파일에 기록 (이 세션의 이전 로그는 삭제)
+    discard_evaluation_log(st.session_state.eval_log_path)
+    st.session_state.eval_log_path = os.path.join(EVAL_LOG_DIR, f"evals_{file_key}_{uuid.uuid4().hex}.jsonl")
+    st.session_state.num_evaluations_for_current_file = 0
+    st.session_state.download_timestamp = None
     st.session_state.evaluation_of_current_file_complete = False
     st.info(f"'{file_key}' 파일에 대한 평가를 시작합니다. 총 {len(st.session_state.sampled_data)}개의 아이템이 샘플링되었습니다.")
 
-# --- Streamlit 앱 UI 구성 ---
-st.set_page_config(page_title=APP_TITLE, layout="wide")
-st.title(APP_TITLE)
-
-initialize_session_state()
-
-# --- 사이드바: 파일 선택 및 관리 ---
-st.sidebar.header("파일 선택 및 관리")
-selected_file_key_from_sidebar = st.sidebar.selectbox(
-    "평가할 파일을 선택하세요:",
-    options=["파일을 선택하세요..."] + list(DATA_FILES.keys()),
-    index=0,
-    key="sb_file_select"
-)
-
-if selected_file_key_from_sidebar != "파일을 선택하세요...":
-    if st.session_state.current_eval_file_key != selected_file_key_from_sidebar:
-        # 다른 파일이 선택되면, 해당 파일로 평가 상태 전환
-        reset_evaluation_state_for_new_file(selected_file_key_from_sidebar)
-        st.rerun() # 상태 변경 후 UI 즉시 업데이트
-    # 같은 파일이 다시 선택된 경우는 현재 상태 유지 (데이터 재로딩 방지)
-else: # "파일을 선택하세요..."가 선택된 경우 (초기 상태 또는 파일 선택 해제)
-    if st.session_state.current_eval_file_key is not None: # 이전에 파일이 선택된 상태였다면 초기화
-        st.session_state.current_eval_file_key = None
-        st.session_state.sampled_data = []
-        st.session_state.current_item_index = 0
-        st.session_state.evaluations_for_current_file = []
-        st.session_state.evaluation_of_current_file_complete = False
-        # st.rerun() # 필요시 즉시 UI 업데이트
-
-if st.sidebar.button("현재 파일 평가 초기화/다시 시작", key="btn_reset_current_file_eval"):
-    if st.session_state.current_eval_file_key and st.session_state.current_eval_file_key != "파일을 선택하세요...":
-        reset_evaluation_state_for_new_file(st.session_state.current_eval_file_key)
-        st.success(f"'{st.session_state.current_eval_file_key}' 파일 평가가 초기화되었습니다.")
-        st.rerun()
-    else:
-        st.sidebar.warning("초기화할 파일을 먼저 선택해주세요.")
-
-# --- 메인 평가 영역 ---
-if not st.session_state.current_eval_file_key or st.session_state.current_eval_file_key == "파일을 선택하세요...":
-    st.info("👈 사이드바에서 평가할 파일을 선택해주세요.")
-elif not st.session_state.sampled_data:
-    st.warning(f"'{st.session_state.current_eval_file_key}' 파일에 대한 샘플링된 데이터가 없습니다. 파일이 비어있거나 로드에 실패했을 수 있습니다.")
-else:
+# --- 평가 화면 렌더링 ---
+# 평가 입력은 모두 st.form 안에 있어 제출 전에는 rerun이 일어나지 않고, 제출 시에는 앱 전체를 다시 실행하므로 fragment로 만들지 않음
+def render_current_item():
+    """현재 평가할 아이템과 평가 입력 폼을 표시합니다."""
     # 현재 평가할 아이템 가져오기
     if st.session_state.current_item_index < len(st.session_state.sampled_data):
         current_item = st.session_state.sampled_data[st.session_state.current_item_index]
@@ -159,10 +205,10 @@ else:
             for i, criterion in enumerate(EVAL_CRITERIA):
                 current_scores[criterion] = st.radio(
                     label=criterion, 
-                    options=list(range(1, 6)), 
+                    options=SCORE_OPTIONS, 
                     index=2, # 기본값 3점
                     horizontal=True, 
-                    key=f"q_{i}_{item_data_id}"
+                    key=f"{EVAL_CRITERIA_KEYS[i]}_{item_data_id}"
                 )
             
             comment = st.text_area("추가 코멘트 (선택 사항)", key=f"comment_{item_data_id}")
@@ -177,16 +223,17 @@ else:
                 "sampled_item_user_a": current_item.get('User A'),
                 "sampled_item_background": current_item.get('background'),
                 "sampled_item_user_b": current_item.get('User B'),
-                "evaluation_scores": current_scores,
+                # 점수는 제출 시점에 score_1 ~ score_N 컬럼으로 펼쳐서 저장
+                **{f"score_{i+1}": current_scores[c] for i, c in enumerate(EVAL_CRITERIA)},
                 "evaluator_comment": comment,
-                "evaluation_timestamp": datetime.now().isoformat()
+                "evaluation_timestamp_ns": time.time_ns() # 다운로드 시 ISO 형식으로 일괄 변환
             }
-            st.session_state.evaluations_for_current_file.append(evaluation_entry)
-            
-            # 전체 평가 결과에도 저장 (선택적 기능)
-            if st.session_state.current_eval_file_key not in st.session_state.all_collected_evaluations:
-                st.session_state.all_collected_evaluations[st.session_state.current_eval_file_key] = []
-            st.session_state.all_collected_evaluations[st.session_state.current_eval_file_key].append(evaluation_entry)
+            # 평가 결과는 디스크에 추가 기록하고, 세션에는 개수만 유지
+            if not append_evaluation_log(st.session_state.eval_log_path, evaluation_entry):
+                return # 기록 실패 시 다음 아이템으로 넘어가지 않음 (입력값은 폼에 그대로 유지)
+            st.session_state.num_evaluations_for_current_file += 1
+            # 다운로드 파일명 시각은 결과가 바뀔 때만 갱신 (rerun 간 파일명/버튼 유지)
+            st.session_state.download_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
             st.session_state.current_item_index += 1
             
@@ -200,49 +247,97 @@ else:
 
     elif st.session_state.evaluation_of_current_file_complete:
         st.header(f"🎉 '{st.session_state.current_eval_file_key}' 파일 평가 완료! 🎉")
-        st.write(f"총 {len(st.session_state.evaluations_for_current_file)}개의 아이템에 대한 평가가 수집되었습니다.")
+        st.write(f"총 {st.session_state.num_evaluations_for_current_file}개의 아이템에 대한 평가가 수집되었습니다.")
     else: # current_item_index >= len(sampled_data) 이지만 아직 완료 플래그가 안 선 경우 (이론상 도달 안함)
         st.info("모든 아이템 평가가 완료된 것 같습니다. 사이드바에서 다른 파일을 선택하거나 결과를 다운로드하세요.")
 
+# 다운로드 버튼 클릭 시 앱 전체가 아닌 이 fragment만 다시 실행됨 (파일 로딩/사이드바/평가 화면 처리 생략)
+@st.fragment
+def render_downloads():
+    """현재 파일의 평가 결과 다운로드 버튼을 표시합니다."""
+    st.divider()
+    st.subheader(f"'{st.session_state.current_eval_file_key}' 파일 평가 결과 다운로드")
+    
+    # 디스크에 기록된 평가 로그를 다운로드 시점에만 읽음 (점수는 이미 score_N 컬럼으로 펼쳐져 있음)
+    results_version = (st.session_state.eval_log_path, st.session_state.num_evaluations_for_current_file)
+    csv_data, json_data = build_download_payloads(*results_version)
+
+    # CSV 다운로드
+    st.download_button(
+        label=f"CSV 다운로드 ({st.session_state.num_evaluations_for_current_file}개 결과)",
+        data=csv_data,
+        file_name=f"evaluations_{st.session_state.current_eval_file_key.replace(' ', '_')}_{st.session_state.download_timestamp}.csv",
+        mime="text/csv",
+        key=f"csv_download_{st.session_state.current_eval_file_key}"
+    )
+
+    # JSON 다운로드
+    st.download_button(
+        label=f"JSON 다운로드 ({st.session_state.num_evaluations_for_current_file}개 결과)",
+        data=json_data,
+        file_name=f"evaluations_{st.session_state.current_eval_file_key.replace(' ', '_')}_{st.session_state.download_timestamp}.json",
+        mime="application/json",
+        key=f"json_download_{st.session_state.current_eval_file_key}"
+    )
+
+
+# --- Streamlit 앱 UI 구성 ---
+st.set_page_config(page_title=APP_TITLE, layout="wide")
+st.title(APP_TITLE)
+
+initialize_session_state()
+
+# --- 사이드바: 파일 선택 및 관리 ---
+st.sidebar.header("파일 선택 및 관리")
+selected_file_key_from_sidebar = st.sidebar.selectbox(
+    "평가할 파일을 선택하세요:",
+    options=SIDEBAR_FILE_OPTIONS,
+    index=0,
+    key="sb_file_select"
+)
+
+if selected_file_key_from_sidebar != "파일을 선택하세요...":
+    if st.session_state.current_eval_file_key != selected_file_key_from_sidebar:
+        # 다른 파일이 선택되면, 해당 파일로 평가 상태 전환
+        reset_evaluation_state_for_new_file(selected_file_key_from_sidebar)
+        st.rerun() # 상태 변경 후 UI 즉시 업데이트
+    # 같은 파일이 다시 선택된 경우는 현재 상태 유지 (데이터 재로딩 방지)
+else: # "파일을 선택하세요..."가 선택된 경우 (초기 상태 또는 파일 선택 해제)
+    if st.session_state.current_eval_file_key is not None: # 이전에 파일이 선택된 상태였다면 초기화
+        st.session_state.current_eval_file_key = None
+        st.session_state.sampled_data = []
+        st.session_state.current_item_index = 0
+        discard_evaluation_log(st.session_state.eval_log_path)
+        st.session_state.eval_log_path = None
+        st.session_state.num_evaluations_for_current_file = 0
+        st.session_state.download_timestamp = None
+        st.session_state.evaluation_of_current_file_complete = False
+        # st.rerun() # 필요시 즉시 UI 업데이트
+
+if st.sidebar.button("현재 파일 평가 초기화/다시 시작", key="btn_reset_current_file_eval"):
+    if st.session_state.current_eval_file_key and st.session_state.current_eval_file_key != "파일을 선택하세요...":
+        # nonce를 증가시켜 새로운 샘플을 뽑음 (아이템 수는 캐시에서 재사용)
+        nonces = st.session_state.sample_nonces
+        nonces[st.session_state.current_eval_file_key] = nonces.get(st.session_state.current_eval_file_key, 0) + 1
+        reset_evaluation_state_for_new_file(st.session_state.current_eval_file_key)
+        st.success(f"'{st.session_state.current_eval_file_key}' 파일 평가가 초기화되었습니다.")
+        st.rerun()
+    else:
+        st.sidebar.warning("초기화할 파일을 먼저 선택해주세요.")
+
+# --- 메인 평가 영역 ---
+if not st.session_state.current_eval_file_key or st.session_state.current_eval_file_key == "파일을 선택하세요...":
+    st.info("👈 사이드바에서 평가할 파일을 선택해주세요.")
+elif not st.session_state.sampled_data:
+    st.warning(f"'{st.session_state.current_eval_file_key}' 파일에 대한 샘플링된 데이터가 없습니다. 파일이 비어있거나 로드에 실패했을 수 있습니다.")
+else:
+    render_current_item()
+
 
 # --- 평가 결과 다운로드 섹션 (현재 파일에 대한 결과) ---
 if st.session_state.current_eval_file_key and st.session_state.current_eval_file_key != "파일을 선택하세요...":
-    if st.session_state.evaluations_for_current_file:
-        st.divider()
-        st.subheader(f"'{st.session_state.current_eval_file_key}' 파일 평가 결과 다운로드")
-        
-        # DataFrame으로 변환
-        df_results = pd.DataFrame(st.session_state.evaluations_for_current_file)
-        
-        # evaluation_scores 딕셔너리를 별도 컬럼으로 펼치기
-        # (주의: 컬럼명이 길어질 수 있음. 필요시 점수만 추출하거나 다른 방식으로 처리)
-        try:
-            scores_df = pd.json_normalize(df_results['evaluation_scores'])
-            # 컬럼명에 접두사 추가 (예: "score_1. 맥락 적합성")
-            scores_df = scores_df.rename(columns={col: f"score_{col}" for col in scores_df.columns})
-            df_final_for_download = pd.concat([df_results.drop(columns=['evaluation_scores']), scores_df], axis=1)
-        except Exception: # 점수 데이터가 없거나 형식이 다를 경우 원본 유지
-            df_final_for_download = df_results
-
-        # CSV 다운로드
-        csv_data = df_final_for_download.to_csv(index=False).encode('utf-8-sig')
-        st.download_button(
-            label=f"CSV 다운로드 ({len(st.session_state.evaluations_for_current_file)}개 결과)",
-            data=csv_data,
-            file_name=f"evaluations_{st.session_state.current_eval_file_key.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv",
-            key=f"csv_download_{st.session_state.current_eval_file_key}"
-        )
-
-        # JSON 다운로드
-        json_data = json.dumps(st.session_state.evaluations_for_current_file, ensure_ascii=False, indent=2)
-        st.download_button(
-            label=f"JSON 다운로드 ({len(st.session_state.evaluations_for_current_file)}개 결과)",
-            data=json_data,
-            file_name=f"evaluations_{st.session_state.current_eval_file_key.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-            mime="application/json",
-            key=f"json_download_{st.session_state.current_eval_file_key}"
-        )
+    if st.session_state.num_evaluations_for_current_file:
+        render_downloads()
 
 # --- 앱 정보 ---
 st.sidebar.divider()